@@ -67,18 +67,20 @@ def main():
     print(f"Confidence Score:    {result.confidence_score * 100:.1f}%")
     print(f"Word Count:          {result.word_count}")
     print(f"Engine Used:         {result.engine_used}")
-    print(f"Glossary Matches:    {len(result.glossary_matches)}")
+    print(f"Glossary Matches:    {len(result.glossary_matches['source'])}")
     print(f"Status:              {result.status}")
     print()
     
     # Show glossary matches
-    if result.glossary_matches:
+    matches = result.glossary_matches
+    if matches['source']:
         print("Glossary Terms Applied:")
         print("-" * 70)
-        for i, match in enumerate(result.glossary_matches, 1):
-            print(f"{i}. {match['source']:25} → {match['target']}")
-            print(f"   Context: {match['context']}")
-            print(f"   Confidence: {match['confidence']}")
+        rows = zip(matches['source'], matches['target'], matches['context'], matches['confidence'])
+        for i, (source, target, context, confidence) in enumerate(rows, 1):
+            print(f"{i}. {source:25} → {target}")
+            print(f"   Context: {context}")
+            print(f"   Confidence: {confidence}")
             print()
     else:
         print("No glossary terms were matched in this text.")
@@ -2,74 +2,599 @@
 Core translation engine with multi-backend support and glossary integration.
 """
 
+import asyncio
+import hashlib
 import json
+import os
+import pickle
 import re
-from typing import Dict, List, Optional, Tuple
+import sys
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 from pathlib import Path
 import logging
 
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional; without it the kernels run as plain Python
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Glossaries at least this large are scanned with Hyperscan when available
+HYPERSCAN_MIN_TERMS = 1000
 
-@dataclass
+# Bump when the pickled glossary index layout changes
+GLOSSARY_CACHE_VERSION = 5
+
+OLLAMA_URL = "http://localhost:11434/api/generate"
+
+# Approximate number of characters sent per batch when streaming documents
+DOCUMENT_CHUNK_SIZE = 4096
+
+# Columns of TranslationResult.glossary_matches, one list per field
+GLOSSARY_MATCH_FIELDS = ('source', 'target', 'position', 'confidence', 'context')
+
+# Compact engine codes used by BatchStats
+ENGINE_CODES = {"none": 0, "google": 1, "ollama": 2}
+
+# slots=True needs Python 3.10+; older versions keep per-instance dicts
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+# Letters re.IGNORECASE treats as equal beyond what str.lower() gives
+# (re._casefix), mapped onto the ordinary lowercase letter
+_CASE_EQUIVALENTS = str.maketrans({
+    '\u0131': 'i', '\u017f': 's', '\u00b5': '\u03bc', '\u0345': '\u03b9',
+    '\u1fbe': '\u03b9', '\u1fd3': '\u0390', '\u1fe3': '\u03b0', '\u03d0': '\u03b2',
+    '\u03f5': '\u03b5', '\u03d1': '\u03b8', '\u03f0': '\u03ba', '\u03d6': '\u03c0',
+    '\u03f1': '\u03c1', '\u03c2': '\u03c3', '\u03d5': '\u03c6', '\u1c80': '\u0432',
+    '\u1c81': '\u0434', '\u1c82': '\u043e', '\u1c83': '\u0441', '\u1c84': '\u0442',
+    '\u1c85': '\u0442', '\u1c86': '\u044a', '\u1c87': '\u0463', '\u1c88': '\ua64b',
+    '\u1e9b': '\u1e61', '\ufb06': '\ufb05'
+})
+
+
+def _fold_case(text: str) -> str:
+    """
+    Lowercase text the way re.IGNORECASE compares characters, keeping its
+    length so offsets into the result are offsets into text.
+    """
+    if text.isascii():
+        return text.lower()
+    # 'İ' is the only character whose lower() is two characters long
+    return text.replace('\u0130', 'i').lower().translate(_CASE_EQUIVALENTS)
+
+
+def _is_word_char(char: str) -> bool:
+    """Check whether a character counts as a word character for \\b."""
+    return char.isalnum() or char == '_'
+
+
+def _is_boundary(text: str, i: int) -> bool:
+    """Check whether \\b matches at index i of text."""
+    before = i > 0 and _is_word_char(text[i - 1])
+    after = i < len(text) and _is_word_char(text[i])
+    return before != after
+
+
+def _on_word_boundary(text: str, start: int, end: int) -> bool:
+    """Check that text[start:end] is bounded like a \\b-anchored match."""
+    return _is_boundary(text, start) and _is_boundary(text, end)
+
+
+def _iter_alternatives_at(
+    text: str,
+    pos: int,
+    pattern: Any,
+    term_ids: Dict[str, int],
+    max_len: int
+) -> Iterator[Tuple[int, int, int]]:
+    """
+    Yield (start, end, term_id) for every alternative of a glossary
+    alternation that matches at pos, longest first.
+    """
+    # Match against a window no longer than the longest term (plus one
+    # character of left context for \b), since RE2 re-encodes its whole
+    # input on every call
+    base = max(pos - 1, 0)
+    window = text[base:pos + max_len]
+    stop = len(window)
+    while stop > pos - base:
+        match = pattern.match(window, pos - base, stop)
+        if match is None:
+            return
+        end = base + match.end()
+        # \b always matches at endpos and the RE2 pattern has no \b at all,
+        # so check the boundaries against the full text
+        term_id = term_ids.get(_fold_case(match.group()))
+        if term_id is not None and _on_word_boundary(text, pos, end):
+            yield pos, end, term_id
+        stop = match.end() - 1
+
+
+def _new_glossary_matches() -> Dict[str, List]:
+    """Create an empty column-wise glossary match table."""
+    return {field: [] for field in GLOSSARY_MATCH_FIELDS}
+
+
+def _async_http_available() -> bool:
+    """Check that aiohttp is installed and asyncio.run() can be called here."""
+    try:
+        import aiohttp  # noqa: F401
+    except ImportError:
+        return False
+    
+    # asyncio.run() can't be nested inside an already running loop
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return True
+    return False
+
+
+@njit(cache=True)
+def _confidence_kernel(
+    src_len: int,
+    trans_len: int,
+    src_words: int,
+    gloss_matches: int
+) -> float:
+    """Unrounded confidence arithmetic for Translator._calculate_confidence."""
+    # Factor 1: Glossary coverage (0-40 points)
+    glossary_score = min(40.0, (gloss_matches / max(src_words, 1)) * 100.0)
+    
+    # Factor 2: Length similarity (0-30 points)
+    length_ratio = trans_len / max(src_len, 1)
+    if 0.5 <= length_ratio <= 2.0:
+        length_score = 30.0
+    elif 0.3 <= length_ratio <= 3.0:
+        length_score = 15.0
+    else:
+        length_score = 5.0
+    
+    # Factor 3: Basic validation (0-30 points)
+    validation_score = 30.0 if trans_len > 10 else 10.0
+    
+    total_score = glossary_score + length_score + validation_score
+    return min(100.0, total_score) / 100.0
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class TranslationResult:
-    """Result of a translation operation."""
+    """
+    Result of a translation operation.
+    glossary_matches holds parallel lists keyed by GLOSSARY_MATCH_FIELDS;
+    row i of every list describes the i-th match.
+    """
     text: str
     confidence_score: float
-    glossary_matches: List[Dict]
+    glossary_matches: Dict[str, List]
     word_count: int
     engine_used: str
     status: str
     metadata: Dict = None
 
 
+@dataclass(**_DATACLASS_SLOTS)
+class BatchStats:
+    """
+    Column-wise summary of a batch of results, one NumPy array per field,
+    so aggregates are computed without looping over result objects.
+    """
+    confidence_score: Any  # float64 array
+    word_count: Any  # int64 array
+    engine_used: Any  # int8 array of ENGINE_CODES values
+    
+    @classmethod
+    def from_results(cls, results: List[TranslationResult]) -> 'BatchStats':
+        """Build batch statistics from translate_batch results."""
+        import numpy as np
+        
+        count = len(results)
+        return cls(
+            confidence_score=np.fromiter(
+                (r.confidence_score for r in results), dtype=np.float64, count=count
+            ),
+            word_count=np.fromiter(
+                (r.word_count for r in results), dtype=np.int64, count=count
+            ),
+            engine_used=np.fromiter(
+                (ENGINE_CODES.get(r.engine_used, 0) for r in results), dtype=np.int8, count=count
+            )
+        )
+    
+    def mean_confidence(self, weighted: bool = True) -> float:
+        """Mean confidence, weighted by word count unless weighted=False."""
+        import numpy as np
+        
+        if not len(self.confidence_score):
+            return 0.0
+        if weighted and self.word_count.sum():
+            return float(np.average(self.confidence_score, weights=self.word_count))
+        return float(self.confidence_score.mean())
+
+
+@dataclass
+class GlossaryIndex:
+    """
+    Compact glossary storage. `terms` maps each lowercased source term to an
+    integer id (a marisa-trie when installed, else a dict). `records` is a
+    NumPy structured array indexed by that id holding the target's offset in
+    `target_pool` (NUL-terminated UTF-8), an index into `context_names` and
+    the confidence quantized to 0-255. `by_domain` groups term ids by the
+    top-level segment of their context ("medical/cardiology" is filed under
+    "medical"; terms without a context under "").
+    """
+    terms: Any
+    records: Any
+    target_pool: bytes
+    context_names: List[str]
+    lengths: List[int]
+    alternatives: Dict[int, List[str]]
+    by_domain: Dict[str, List[int]]
+    automaton: Any = None
+    
+    def target(self, term_id: int) -> str:
+        """Target translation of a term."""
+        offset = int(self.records['tgt_off'][term_id])
+        end = self.target_pool.index(b'\x00', offset)
+        return self.target_pool[offset:end].decode('utf-8')
+    
+    def context(self, term_id: int) -> str:
+        """Context of a term ('' if none)."""
+        return self.context_names[self.records['ctx_id'][term_id]]
+    
+    def confidence(self, term_id: int) -> float:
+        """Confidence of a term, restored from its 8-bit quantized value."""
+        return round(int(self.records['conf_q8'][term_id]) / 255, 2)
+
+
 class Translator:
     """
     Main translation engine supporting multiple backends and glossary integration.
     """
     
+    # Fixed part of every Ollama /api/generate request; "prompt" is added per call
+    _OLLAMA_PAYLOAD = {"model": "mistral", "stream": False}
+    
     def __init__(
         self,
         source_lang: str = "en",
         target_lang: str = "sw",
         glossary_path: Optional[str] = None,
         use_local_llm: bool = False,
-        api_key: Optional[str] = None
+        api_key: Optional[str] = None,
+        cache_size: int = 1024,
+        backend_concurrency: int = 8
     ):
         self.source_lang = source_lang
         self.target_lang = target_lang
+        self._index = None
+        self._matcher = None
+        self._domain_matchers = {}
         self.glossary = self._load_glossary(glossary_path) if glossary_path else {}
         self.use_local_llm = use_local_llm
         self.api_key = api_key
-        self.translation_cache = {}
+        self.cache_size = cache_size
+        self.translation_cache = OrderedDict()
+        # Parallel backend requests per batch; match Ollama's num_parallel
+        self.backend_concurrency = backend_concurrency
+        
+        # Keep-alive connection pool so consecutive Ollama calls reuse sockets
+        self._http = requests.Session()
+        self._http.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=max(8, backend_concurrency)))
+        
+        # The language pair is fixed, so prompts only need the text filled in
+        self._ollama_prompt_tmpl = self._build_ollama_prompt_template()
         
         logger.info(f"Translator initialized: {source_lang} -> {target_lang}")
         if self.glossary:
             logger.info(f"Loaded glossary with {len(self.glossary)} terms")
     
-    def _load_glossary(self, path: str) -> Dict:
-        """Load glossary from JSON file."""
+    def _load_glossary(self, path: str) -> Any:
+        """Load glossary from JSON file, reusing a pickled index when fresh."""
         try:
+            cache_path = Path(path).with_suffix('.glossary.pkl')
+            src_mtime = os.stat(path).st_mtime_ns
+            index = self._read_glossary_cache(cache_path, src_mtime)
+            if index is not None:
+                self._build_matcher(index)
+                self._index = index
+                return index.terms
+            
             with open(path, 'r', encoding='utf-8') as f:
                 data = json.load(f)
-                # Convert to lookup dict for faster access
-                glossary = {}
-                for category, terms in data.items():
-                    for term in terms:
-                        source = term['source'].lower()
-                        glossary[source] = {
-                            'target': term['target'],
-                            'context': term.get('context', ''),
-                            'confidence': term.get('confidence', 1.0),
-                            'alternatives': term.get('alternatives', [])
-                        }
-                return glossary
+            index = self._build_glossary_index(data)
+            
+            self._build_matcher(index)
+            self._write_glossary_cache(cache_path, src_mtime, index)
+            self._index = index
+            return index.terms
         except Exception as e:
             logger.error(f"Error loading glossary: {e}")
             return {}
     
+    def _build_glossary_index(self, data: Dict) -> GlossaryIndex:
+        """Convert parsed glossary JSON into a compact GlossaryIndex."""
+        # Later entries override earlier ones, as with a plain lookup dict
+        entries = {}
+        for category, terms in data.items():
+            for term in terms:
+                entries[term['source'].lower()] = term
+        
+        try:
+            import marisa_trie
+            term_ids = marisa_trie.Trie(entries)
+        except ImportError:
+            term_ids = {source: i for i, source in enumerate(entries)}
+        
+        import numpy as np
+        
+        # Contexts repeat across many terms; store each one once
+        context_ids = {}
+        for term in entries.values():
+            context_ids.setdefault(term.get('context', ''), len(context_ids))
+        
+        count = len(entries)
+        records = np.zeros(count, dtype=[
+            ('tgt_off', 'u4'),
+            ('ctx_id', 'u2' if len(context_ids) <= 0xFFFF else 'u4'),
+            ('conf_q8', 'u1')
+        ])
+        targets = [b''] * count
+        lengths = [0] * count
+        alternatives = {}
+        by_domain = {}
+        for source, term in entries.items():
+            i = term_ids[source]
+            context = term.get('context', '')
+            confidence = min(max(float(term.get('confidence', 1.0)), 0.0), 1.0)
+            targets[i] = term['target'].encode('utf-8') + b'\x00'
+            records[i]['ctx_id'] = context_ids[context]
+            records[i]['conf_q8'] = round(confidence * 255)
+            lengths[i] = len(source)
+            by_domain.setdefault(context.split('/', 1)[0], []).append(i)
+            if term.get('alternatives'):
+                alternatives[i] = term['alternatives']
+        
+        # Offsets follow term id order, so targets sit in the pool sequentially
+        offset = 0
+        for i, target in enumerate(targets):
+            records[i]['tgt_off'] = offset
+            offset += len(target)
+        
+        return GlossaryIndex(
+            terms=term_ids,
+            records=records,
+            target_pool=b''.join(targets),
+            context_names=list(context_ids),
+            lengths=lengths,
+            alternatives=alternatives,
+            by_domain=by_domain
+        )
+    
+    def _read_glossary_cache(
+        self,
+        cache_path: Path,
+        src_mtime: int
+    ) -> Optional[GlossaryIndex]:
+        """
+        Read a pickled glossary index written by _write_glossary_cache.
+        Returns None if the cache is missing, unreadable or stale.
+        """
+        if not cache_path.exists():
+            return None
+        
+        try:
+            with open(cache_path, 'rb') as f:
+                version, mtime, index = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable glossary cache {cache_path}: {e}")
+            return None
+        
+        if version != GLOSSARY_CACHE_VERSION or mtime != src_mtime:
+            return None
+        
+        logger.info(f"Loaded glossary index from {cache_path}")
+        return index
+    
+    def _write_glossary_cache(self, cache_path: Path, src_mtime: int, index: GlossaryIndex):
+        """Pickle the glossary index and its automaton next to the source JSON."""
+        tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(
+                    (GLOSSARY_CACHE_VERSION, src_mtime, index),
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL
+                )
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            logger.warning(f"Could not write glossary cache {cache_path}: {e}")
+    
+    def _build_matcher(self, index: GlossaryIndex):
+        """Build the matcher for the full glossary, reusing a cached automaton."""
+        self._matcher = self._compile_matcher(list(index.terms.items()), index.automaton)
+        if self._matcher is not None and self._matcher[0] == 'automaton':
+            index.automaton = self._matcher[1]
+    
+    def _compile_matcher(
+        self,
+        items: List[Tuple[str, int]],
+        automaton: Any = None
+    ) -> Optional[Tuple[str, Any]]:
+        """
+        Build one case-insensitive multi-pattern matcher over (term, id) pairs
+        so the text is scanned once regardless of glossary size.
+        Returns a (kind, engine) pair, or None for an empty term list.
+        """
+        if not items:
+            return None
+        
+        if len(items) >= HYPERSCAN_MIN_TERMS:
+            db = self._build_hyperscan(items)
+            if db is not None:
+                return 'hyperscan', db
+        
+        if automaton is not None:
+            return 'automaton', automaton
+        
+        try:
+            import ahocorasick
+        except ImportError:
+            ahocorasick = None
+        
+        if ahocorasick is not None:
+            # Values are term ids, so the automaton stores plain ints
+            automaton = ahocorasick.Automaton(ahocorasick.STORE_INTS)
+            for source_term, i in items:
+                automaton.add_word(_fold_case(source_term), i)
+            automaton.make_automaton()
+            return 'automaton', automaton
+        
+        # Fall back to a single alternation; longest terms first so
+        # multi-word terms win over the shorter terms they contain
+        terms_sorted = sorted((term for term, _ in items), key=len, reverse=True)
+        alternation = '(?:' + '|'.join(map(re.escape, terms_sorted)) + ')'
+        # A hit folds to the same key as the term it matched
+        term_ids = {_fold_case(term): i for term, i in items}
+        max_len = len(terms_sorted[0])
+        
+        # Prefer RE2, which matches the alternation in linear time as a DFA.
+        # Its \b only knows ASCII word characters (and would reject terms
+        # ending in 'é'), so leave it out and check boundaries per hit
+        try:
+            import re2
+            return 'regex', (re2.compile('(?i)' + alternation), term_ids, max_len)
+        except ImportError:
+            pass
+        except Exception as e:
+            # e.g. the alternation exceeds RE2's memory budget
+            logger.warning(f"RE2 compilation failed, using re: {e}")
+        
+        pattern = re.compile(r'\b' + alternation + r'\b', re.IGNORECASE)
+        return 'regex', (pattern, term_ids, max_len)
+    
+    def _build_hyperscan(self, items: List[Tuple[str, int]]) -> Any:
+        """
+        Compile (term, id) pairs into a Hyperscan database.
+        Returns None if Hyperscan is unavailable or compilation fails.
+        """
+        try:
+            import hyperscan
+        except ImportError:
+            return None
+        
+        terms, ids = zip(*items)
+        try:
+            db = hyperscan.Database()
+            db.compile(
+                expressions=[re.escape(term).encode('utf-8') for term in terms],
+                ids=list(ids),
+                flags=[
+                    hyperscan.HS_FLAG_CASELESS
+                    | hyperscan.HS_FLAG_SOM_LEFTMOST
+                    | hyperscan.HS_FLAG_UTF8
+                ] * len(terms)
+            )
+        except Exception as e:
+            logger.warning(f"Hyperscan compilation failed, falling back: {e}")
+            return None
+        
+        return db
+    
+    def _get_matcher(self, domain: Optional[str]) -> Optional[Tuple[str, Any]]:
+        """Return the matcher for a domain, building and memoizing it on first use."""
+        if not domain or self._index is None:
+            return self._matcher
+        
+        if domain not in self._domain_matchers:
+            term_ids = set(self._domain_term_ids(domain))
+            items = [(term, i) for term, i in self._index.terms.items() if i in term_ids]
+            self._domain_matchers[domain] = self._compile_matcher(items)
+        return self._domain_matchers[domain]
+    
+    def _domain_term_ids(self, domain: str) -> List[int]:
+        """
+        Ids of terms whose context starts with domain, plus terms without a
+        context, found through the top-level buckets of index.by_domain.
+        """
+        by_domain = self._index.by_domain
+        term_ids = list(by_domain.get('', []))
+        
+        if '/' in domain:
+            top = domain.split('/', 1)[0]
+            index = self._index
+            term_ids.extend(
+                i for i in by_domain.get(top, []) if index.context(i).startswith(domain)
+            )
+        else:
+            # Without a '/', every context in a bucket matches iff its key does
+            for key, ids in by_domain.items():
+                if key and key.startswith(domain):
+                    term_ids.extend(ids)
+        return term_ids
+    
+    def _iter_glossary_hits(
+        self,
+        text: str,
+        matcher: Optional[Tuple[str, Any]]
+    ) -> Iterator[Tuple[int, int, int]]:
+        """Yield (start, end, term_id) for every glossary term in text."""
+        if matcher is None:
+            return
+        kind, engine = matcher
+        
+        if kind == 'hyperscan':
+            data = text.encode('utf-8')
+            hits = []
+            
+            def on_match(term_id, frm, to, flags, context):
+                context.append((term_id, frm, to))
+            
+            engine.scan(data, match_event_handler=on_match, context=hits)
+            if len(data) != len(text):
+                # Hyperscan reports byte offsets; walk the hits in start order
+                # so each byte of the text is decoded once to count characters
+                hits.sort(key=lambda hit: hit[1])
+            byte_pos = char_pos = 0
+            for term_id, frm, to in hits:
+                if len(data) == len(text):
+                    start, end = frm, to
+                else:
+                    char_pos += len(data[byte_pos:frm].decode('utf-8'))
+                    byte_pos = frm
+                    start = char_pos
+                    end = start + len(data[frm:to].decode('utf-8'))
+                if _on_word_boundary(text, start, end):
+                    yield start, end, term_id
+        elif kind == 'automaton':
+            lengths = self._index.lengths
+            for end, term_id in engine.iter(_fold_case(text)):
+                # Enforce word boundaries (same semantics as the \b anchors)
+                start = end - lengths[term_id] + 1
+                if _on_word_boundary(text, start, end + 1):
+                    yield start, end + 1, term_id
+        else:
+            pattern, term_ids, max_len = engine
+            for match in pattern.finditer(text):
+                # A single pass only reports the longest term at each match;
+                # the terms nested in or overlapping it start inside its span
+                for pos in range(match.start(), match.end()):
+                    if _is_boundary(text, pos):
+                        yield from _iter_alternatives_at(text, pos, pattern, term_ids, max_len)
+    
     def translate_text(
         self,
         text: str,
@@ -88,112 +613,205 @@ class Translator:
             TranslationResult with translation and metadata
         """
         # Check cache first
-        cache_key = f"{text[:100]}_{self.source_lang}_{self.target_lang}"
+        cache_key = self._cache_key(text, domain)
         if cache_key in self.translation_cache:
             logger.info("Using cached translation")
+            self.translation_cache.move_to_end(cache_key)
             return self.translation_cache[cache_key]
         
         # Step 1: Apply glossary replacements
-        glossary_matches = []
-        preprocessed_text, matches = self._apply_glossary(text, domain)
-        glossary_matches.extend(matches)
+        preprocessed_text, glossary_matches = self._apply_glossary(text, domain)
         
         # Step 2: Translate using selected backend
         if self.use_local_llm:
-            translated = self._translate_with_ollama(preprocessed_text)
+            translated, ok = self._translate_with_ollama(preprocessed_text)
             engine = "ollama"
         else:
-            translated = self._translate_with_google(preprocessed_text)
+            translated, ok = self._translate_with_google(preprocessed_text)
             engine = "google"
         
-        # Step 3: Calculate confidence score
+        # Steps 3-4: Score and create result
+        result = self._build_result(text, translated, ok, glossary_matches, engine, domain)
+        
+        # Cache the result (failed translations are retried next time)
+        if ok:
+            self._cache_result(cache_key, result)
+        
+        return result
+    
+    def translate_batch(
+        self,
+        texts: List[str],
+        domain: Optional[str] = None
+    ) -> List[TranslationResult]:
+        """
+        Translate several text segments, sending backend requests in parallel.
+        
+        Args:
+            texts: Source segments to translate (e.g. paragraphs)
+            domain: Optional domain context for better term selection
+            
+        Returns:
+            One TranslationResult per input segment, in input order
+            (see BatchStats.from_results for vectorised aggregates)
+        """
+        results: List[Optional[TranslationResult]] = [None] * len(texts)
+        pending = []
+        for i, text in enumerate(texts):
+            cache_key = self._cache_key(text, domain)
+            if cache_key in self.translation_cache:
+                self.translation_cache.move_to_end(cache_key)
+                results[i] = self.translation_cache[cache_key]
+            else:
+                pending.append(i)
+        
+        if pending:
+            preprocessed = [self._apply_glossary(texts[i], domain) for i in pending]
+            translations, engine = self._translate_many([p[0] for p in preprocessed])
+            
+            for i, (_, matches), (translated, ok) in zip(pending, preprocessed, translations):
+                result = self._build_result(texts[i], translated, ok, matches, engine, domain)
+                if ok:
+                    self._cache_result(self._cache_key(texts[i], domain), result)
+                results[i] = result
+        
+        return results
+    
+    def _translate_many(self, texts: List[str]) -> Tuple[List[Tuple[str, bool]], str]:
+        """
+        Translate segments concurrently with the selected backend, in order.
+        Returns one (text, ok) pair per segment and the engine name.
+        """
+        engine = "ollama" if self.use_local_llm else "google"
+        if len(texts) > 1 and self.backend_concurrency > 1:
+            if self.use_local_llm and _async_http_available():
+                return self._translate_batch_with_ollama(texts), engine
+            
+            # Requests are I/O bound, so threads overlap them well
+            workers = min(self.backend_concurrency, len(texts))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(self._translate_one, texts)), engine
+        
+        return [self._translate_one(text) for text in texts], engine
+    
+    def _translate_one(self, text: str) -> Tuple[str, bool]:
+        """Translate a single segment with the selected backend."""
+        if self.use_local_llm:
+            return self._translate_with_ollama(text)
+        return self._translate_with_google(text)
+    
+    def _build_result(
+        self,
+        text: str,
+        translated: str,
+        ok: bool,
+        glossary_matches: Dict[str, List],
+        engine: str,
+        domain: Optional[str]
+    ) -> TranslationResult:
+        """Score a translation and wrap it in a TranslationResult."""
+        # Split once; the word count feeds the score and the metadata
+        n_words = len(text.split())
+        n_matches = len(glossary_matches['source'])
         confidence = self._calculate_confidence(
             text, 
             translated, 
-            len(glossary_matches)
+            n_matches,
+            n_words,
+            ok
         )
         
-        # Step 4: Create result
-        result = TranslationResult(
+        return TranslationResult(
             text=translated,
             confidence_score=confidence,
             glossary_matches=glossary_matches,
-            word_count=len(text.split()),
+            word_count=n_words,
             engine_used=engine,
             status="success",
             metadata={
                 'domain': domain,
-                'glossary_coverage': len(glossary_matches) / len(text.split()) if text.split() else 0
+                'glossary_coverage': n_matches / n_words if n_words else 0
             }
         )
-        
-        # Cache the result
+    
+    def _cache_result(self, cache_key: Tuple, result: TranslationResult):
+        """Store a result, evicting least recently used entries beyond cache_size."""
         self.translation_cache[cache_key] = result
+        # cache_size may have been lowered since the last insert
+        while len(self.translation_cache) > self.cache_size:
+            self.translation_cache.popitem(last=False)
+    
+    def _cache_key(self, text: str, domain: Optional[str]) -> Tuple:
+        """Build a cache key from a hash of the full text and the language pair."""
+        digest = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+        return (digest, self.source_lang, self.target_lang, domain)
+    
+    def invalidate(self, text: str, domain: Optional[str] = None) -> bool:
+        """
+        Drop a cached translation, e.g. after the glossary or source changes.
         
-        return result
+        Args:
+            text: Source text whose translation should be evicted
+            domain: Domain the text was translated with
+            
+        Returns:
+            True if a cached entry was removed
+        """
+        return self.translation_cache.pop(self._cache_key(text, domain), None) is not None
     
     def _apply_glossary(
         self, 
         text: str, 
         domain: Optional[str] = None
-    ) -> Tuple[str, List[Dict]]:
+    ) -> Tuple[str, Dict[str, List]]:
         """
         Apply glossary terms to text before translation.
-        Returns preprocessed text and list of matches.
+        Returns preprocessed text and column-wise matches.
         """
-        matches = []
+        matches = _new_glossary_matches()
+        sources = matches['source']
+        targets = matches['target']
+        positions = matches['position']
+        confidences = matches['confidence']
+        contexts = matches['context']
         result_text = text
         
-        # Sort glossary terms by length (longest first) to handle multi-word terms
-        sorted_terms = sorted(
-            self.glossary.items(), 
-            key=lambda x: len(x[0]), 
-            reverse=True
-        )
-        
-        for source_term, term_data in sorted_terms:
-            # Check if domain matches if specified
-            if domain and term_data.get('context'):
-                if not term_data['context'].startswith(domain):
-                    continue
-            
-            # Create case-insensitive pattern
-            pattern = re.compile(r'\b' + re.escape(source_term) + r'\b', re.IGNORECASE)
+        # The domain's matcher only contains terms valid for that domain
+        index = self._index
+        for start, end, term_id in self._iter_glossary_hits(text, self._get_matcher(domain)):
+            sources.append(text[start:end])
+            targets.append(index.target(term_id))
+            positions.append(start)
+            confidences.append(index.confidence(term_id))
+            contexts.append(index.context(term_id))
             
-            # Find matches
-            for match in pattern.finditer(result_text):
-                matches.append({
-                    'source': match.group(),
-                    'target': term_data['target'],
-                    'position': match.start(),
-                    'confidence': term_data['confidence'],
-                    'context': term_data.get('context', '')
-                })
-                
-                # Replace in text (for now, keep source to maintain context)
-                # In production, you might want to mark these for post-processing
+            # Replace in text (for now, keep source to maintain context)
+            # In production, you might want to mark these for post-processing
         
         return result_text, matches
     
-    def _translate_with_ollama(self, text: str) -> str:
-        """Translate using local Ollama LLM."""
-        try:
-            import requests
-            
-            prompt = f"""Translate the following text from {self.source_lang} to {self.target_lang}.
+    def _build_ollama_prompt_template(self) -> str:
+        """Bake the language pair into the Ollama prompt, leaving a %s for the text."""
+        return f"""Translate the following text from {self.source_lang} to {self.target_lang}.
 Maintain the original meaning and technical accuracy.
 
-Text: {text}
+Text: %s
 
 Translation:"""
-            
-            response = requests.post(
-                "http://localhost:11434/api/generate",
-                json={
-                    "model": "mistral",
-                    "prompt": prompt,
-                    "stream": False
-                },
+    
+    def _ollama_prompt(self, text: str) -> str:
+        """Build the Ollama translation prompt for a text."""
+        return self._ollama_prompt_tmpl % text
+    
+    def _translate_with_ollama(self, text: str) -> Tuple[str, bool]:
+        """
+        Translate using local Ollama LLM.
+        Returns the translation and whether it succeeded.
+        """
+        try:
+            response = self._http.post(
+                OLLAMA_URL,
+                json={**self._OLLAMA_PAYLOAD, "prompt": self._ollama_prompt(text)},
                 timeout=120
             )
             
@@ -201,7 +819,7 @@ Translation:"""
                 result = response.json()
                 translation = result.get('response', '').strip()
                 logger.info("Ollama translation successful")
-                return translation
+                return translation, True
             else:
                 logger.error(f"Ollama error: {response.status_code}")
                 return self._translate_with_google(text)  # Fallback
@@ -210,8 +828,11 @@ Translation:"""
             logger.error(f"Ollama translation failed: {e}")
             return self._translate_with_google(text)  # Fallback
     
-    def _translate_with_google(self, text: str) -> str:
-        """Translate using Google Translate API."""
+    def _translate_with_google(self, text: str) -> Tuple[str, bool]:
+        """
+        Translate using Google Translate API.
+        Returns the translation (or an error marker) and whether it succeeded.
+        """
         try:
             # Using googletrans library (free tier)
             from googletrans import Translator as GoogleTranslator
@@ -219,43 +840,75 @@ Translation:"""
             gt = GoogleTranslator()
             result = gt.translate(text, src=self.source_lang, dest=self.target_lang)
             logger.info("Google Translate successful")
-            return result.text
+            return result.text, True
             
         except Exception as e:
             logger.error(f"Google Translate failed: {e}")
-            return f"[Translation Error: {str(e)}]"
+            return f"[Translation Error: {str(e)}]", False
+    
+    async def _translate_with_ollama_async(self, texts: List[str]) -> List[Optional[str]]:
+        """
+        Translate segments with concurrent Ollama requests.
+        Failed segments are returned as None.
+        """
+        import aiohttp
+        
+        # Per-read timeout so one stalled request doesn't hold up the batch
+        timeout = aiohttp.ClientTimeout(total=120, sock_read=30)
+        connector = aiohttp.TCPConnector(limit=self.backend_concurrency)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            
+            async def translate_one(text: str) -> Optional[str]:
+                try:
+                    payload = {**self._OLLAMA_PAYLOAD, "prompt": self._ollama_prompt(text)}
+                    async with session.post(OLLAMA_URL, json=payload) as response:
+                        if response.status == 200:
+                            result = await response.json()
+                            return result.get('response', '').strip()
+                        logger.error(f"Ollama error: {response.status}")
+                except Exception as e:
+                    logger.error(f"Ollama translation failed: {e}")
+                return None
+            
+            return await asyncio.gather(*(translate_one(text) for text in texts))
+    
+    def _translate_batch_with_ollama(self, texts: List[str]) -> List[Tuple[str, bool]]:
+        """Translate segments with overlapping aiohttp requests to Ollama."""
+        translations = asyncio.run(self._translate_with_ollama_async(texts))
+        logger.info(f"Ollama batch translation finished ({len(texts)} segments)")
+        return [
+            (translation, True) if translation is not None else self._translate_with_google(text)  # Fallback
+            for text, translation in zip(texts, translations)
+        ]
     
     def _calculate_confidence(
         self, 
         source: str, 
         translation: str, 
-        glossary_matches: int
+        glossary_matches: int,
+        source_words: Optional[int] = None,
+        translation_ok: bool = True
     ) -> float:
         """
         Calculate confidence score for translation.
         Factors: glossary coverage, length similarity, translation success.
+        Pass source_words when the caller has already counted them, and
+        translation_ok=False when the backend reported a failure.
         """
-        if "[Translation Error" in translation:
+        if not translation_ok:
             return 0.0
         
-        # Factor 1: Glossary coverage (0-40 points)
-        source_words = len(source.split())
-        glossary_score = min(40, (glossary_matches / max(source_words, 1)) * 100)
-        
-        # Factor 2: Length similarity (0-30 points)
-        length_ratio = len(translation) / max(len(source), 1)
-        if 0.5 <= length_ratio <= 2.0:
-            length_score = 30
-        elif 0.3 <= length_ratio <= 3.0:
-            length_score = 15
-        else:
-            length_score = 5
-        
-        # Factor 3: Basic validation (0-30 points)
-        validation_score = 30 if translation and len(translation) > 10 else 10
+        if source_words is None:
+            source_words = len(source.split())
         
-        total_score = glossary_score + length_score + validation_score
-        return round(min(100, total_score) / 100, 2)
+        score = _confidence_kernel(
+            len(source),
+            len(translation),
+            source_words,
+            glossary_matches
+        )
+        # Round in Python; numba's round() differs on some halfway cases
+        return round(score, 2)
     
     def translate_document(
         self,
@@ -281,84 +934,179 @@ Translation:"""
             return TranslationResult(
                 text="",
                 confidence_score=0.0,
-                glossary_matches=[],
+                glossary_matches=_new_glossary_matches(),
                 word_count=0,
                 engine_used="none",
                 status="error",
                 metadata={'error': 'File not found'}
             )
         
-        # Extract text based on file type
-        if input_path.suffix == '.docx':
-            text = self._extract_from_docx(input_file)
-        elif input_path.suffix == '.pdf':
-            text = self._extract_from_pdf(input_file)
-        elif input_path.suffix == '.txt':
-            with open(input_file, 'r', encoding='utf-8') as f:
-                text = f.read()
-        else:
+        # Check file type before reading anything
+        if input_path.suffix not in ('.docx', '.pdf', '.txt'):
             logger.error(f"Unsupported file type: {input_path.suffix}")
             return TranslationResult(
                 text="",
                 confidence_score=0.0,
-                glossary_matches=[],
+                glossary_matches=_new_glossary_matches(),
                 word_count=0,
                 engine_used="none",
                 status="error",
                 metadata={'error': 'Unsupported file type'}
             )
         
-        # Translate the text
-        result = self.translate_text(text, domain=domain)
+        # Translate pages/paragraphs in ~DOCUMENT_CHUNK_SIZE batches as they
+        # are read, so the source document is never held in memory at once
+        translated_parts = []
+        glossary_matches = _new_glossary_matches()
+        totals = {'words': 0, 'weighted_confidence': 0.0}
+        engines = []
         
-        # Save to output file if specified
+        def translate_segments() -> Iterator[str]:
+            for chunk in self._iter_chunks(self._iter_segments(input_path)):
+                texts = [segment for _, segment in chunk if segment.strip()]
+                seg_results = iter(self.translate_batch(texts, domain))
+                for offset, segment in chunk:
+                    if not segment.strip():
+                        # Blank paragraphs go to the output untranslated
+                        yield segment
+                        continue
+                    seg_result = next(seg_results)
+                    # Keep match positions relative to the whole document
+                    seg_matches = seg_result.glossary_matches
+                    for field in GLOSSARY_MATCH_FIELDS:
+                        if field == 'position':
+                            glossary_matches[field].extend(
+                                position + offset for position in seg_matches[field]
+                            )
+                        else:
+                            glossary_matches[field].extend(seg_matches[field])
+                    totals['words'] += seg_result.word_count
+                    totals['weighted_confidence'] += (
+                        seg_result.confidence_score * seg_result.word_count
+                    )
+                    engines.append(seg_result.engine_used)
+                    translated_parts.append(seg_result.text)
+                    yield seg_result.text
+        
+        # Save to output file if specified, writing each segment as it arrives
         if output_file:
-            self._save_translation(result.text, output_file, input_path.suffix)
+            self._save_translation(translate_segments(), output_file, input_path.suffix)
             logger.info(f"Translation saved to {output_file}")
+        else:
+            for _ in translate_segments():
+                pass
         
-        return result
+        word_count = totals['words']
+        return TranslationResult(
+            text='\n\n'.join(translated_parts),
+            confidence_score=round(totals['weighted_confidence'] / word_count, 2) if word_count else 0.0,
+            glossary_matches=glossary_matches,
+            word_count=word_count,
+            engine_used=engines[0] if engines else "none",
+            status="success",
+            metadata={
+                'domain': domain,
+                'glossary_coverage': len(glossary_matches['source']) / word_count if word_count else 0
+            }
+        )
+    
+    def _iter_segments(self, input_path: Path) -> Iterator[Tuple[int, str]]:
+        """
+        Yield (offset, segment) for the pages or paragraphs of a supported
+        file, where offset is the segment's position in the extracted text.
+        """
+        if input_path.suffix == '.docx':
+            return self._iter_docx_paragraphs(str(input_path))
+        if input_path.suffix == '.pdf':
+            return self._iter_pdf_pages(str(input_path))
+        return self._iter_txt_paragraphs(str(input_path))
+    
+    def _iter_chunks(
+        self,
+        segments: Iterator[Tuple[int, str]],
+        chunk_size: int = DOCUMENT_CHUNK_SIZE
+    ) -> Iterator[List[Tuple[int, str]]]:
+        """
+        Group (offset, segment) pairs into batches of roughly chunk_size
+        characters. Blank segments stay in place but don't count.
+        """
+        chunk = []
+        size = 0
+        for offset, segment in segments:
+            chunk.append((offset, segment))
+            if segment.strip():
+                size += len(segment)
+            if size >= chunk_size:
+                yield chunk
+                chunk = []
+                size = 0
+        if chunk:
+            yield chunk
     
-    def _extract_from_docx(self, file_path: str) -> str:
-        """Extract text from DOCX file."""
+    def _iter_docx_paragraphs(self, file_path: str) -> Iterator[Tuple[int, str]]:
+        """Yield (offset, paragraph) from a DOCX file, paragraphs joined by newlines."""
         try:
             from docx import Document
             doc = Document(file_path)
-            return '\n'.join([paragraph.text for paragraph in doc.paragraphs])
+            offset = 0
+            for paragraph in doc.paragraphs:
+                yield offset, paragraph.text
+                offset += len(paragraph.text) + 1
         except Exception as e:
             logger.error(f"Error reading DOCX: {e}")
-            return ""
     
-    def _extract_from_pdf(self, file_path: str) -> str:
-        """Extract text from PDF file."""
+    def _iter_pdf_pages(self, file_path: str) -> Iterator[Tuple[int, str]]:
+        """Yield (offset, page text) for each page in a PDF file."""
         try:
             import PyPDF2
             with open(file_path, 'rb') as f:
                 reader = PyPDF2.PdfReader(f)
-                text = ''
+                offset = 0
                 for page in reader.pages:
-                    text += page.extract_text()
-                return text
+                    page_text = page.extract_text() or ''
+                    yield offset, page_text
+                    offset += len(page_text)
         except Exception as e:
             logger.error(f"Error reading PDF: {e}")
-            return ""
     
-    def _save_translation(self, text: str, output_file: str, format: str):
-        """Save translation to file in appropriate format."""
+    def _iter_txt_paragraphs(self, file_path: str) -> Iterator[Tuple[int, str]]:
+        """Yield (offset, paragraph) for blank-line separated paragraphs of a text file."""
+        with open(file_path, 'r', encoding='utf-8') as f:
+            lines = []
+            start = offset = 0
+            for line in f:
+                if line.strip():
+                    if not lines:
+                        start = offset
+                    lines.append(line)
+                elif lines:
+                    yield start, ''.join(lines).rstrip('\n')
+                    lines = []
+                offset += len(line)
+            if lines:
+                yield start, ''.join(lines).rstrip('\n')
+    
+    def _save_translation(self, segments: Iterator[str], output_file: str, format: str):
+        """Save translated segments to file in appropriate format."""
         output_path = Path(output_file)
         
         if format == '.docx':
             try:
                 from docx import Document
                 doc = Document()
-                for paragraph in text.split('\n'):
-                    doc.add_paragraph(paragraph)
+                for segment in segments:
+                    for paragraph in segment.split('\n'):
+                        doc.add_paragraph(paragraph)
                 doc.save(output_path)
             except Exception as e:
                 logger.error(f"Error saving DOCX: {e}")
         else:
             # Default to text file
             with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(text)
+                for i, segment in enumerate(segments):
+                    if i:
+                        f.write('\n\n')
+                    f.write(segment)
 
 
 # Example usage
@@ -378,5 +1126,5 @@ if __name__ == "__main__":
     print(f"Original: {sample_text}")
     print(f"Translation: {result.text}")
     print(f"Confidence: {result.confidence_score * 100}%")
-    print(f"Glossary matches: {len(result.glossary_matches)}")
+    print(f"Glossary matches: {len(result.glossary_matches['source'])}")
     print(f"Engine: {result.engine_used}")
\ No newline at end of file
@@ -0,0 +1,55 @@
+"""
+Confidence scoring tests: the (optionally numba-compiled) kernel must give
+the same scores as the original pure-Python arithmetic.
+"""
+
+import random
+
+import pytest
+
+from src.core.translator import Translator
+
+
+def original_confidence(source, translation, glossary_matches):
+    """The original Translator._calculate_confidence."""
+    if "[Translation Error" in translation:
+        return 0.0
+
+    source_words = len(source.split())
+    glossary_score = min(40, (glossary_matches / max(source_words, 1)) * 100)
+
+    length_ratio = len(translation) / max(len(source), 1)
+    if 0.5 <= length_ratio <= 2.0:
+        length_score = 30
+    elif 0.3 <= length_ratio <= 3.0:
+        length_score = 15
+    else:
+        length_score = 5
+
+    validation_score = 30 if translation and len(translation) > 10 else 10
+
+    total_score = glossary_score + length_score + validation_score
+    return round(min(100, total_score) / 100, 2)
+
+
+@pytest.fixture(scope="module")
+def translator():
+    return Translator()
+
+
+def test_matches_original_scores(translator):
+    rng = random.Random(0)
+    for _ in range(5000):
+        source = " ".join("w" * rng.randint(1, 8) for _ in range(rng.randint(0, 40)))
+        translation = "t" * rng.randint(0, 3 * len(source) + 20)
+        matches = rng.randint(0, 12)
+
+        expected = original_confidence(source, translation, matches)
+        assert translator._calculate_confidence(source, translation, matches) == expected
+        assert translator._calculate_confidence(
+            source, translation, matches, source_words=len(source.split())
+        ) == expected
+
+
+def test_failed_translation_scores_zero(translator):
+    assert translator._calculate_confidence("heart rate", "kiwango", 1, translation_ok=False) == 0.0
@@ -0,0 +1,137 @@
+"""
+Glossary matching tests.
+
+Every matcher backend (Hyperscan, Aho-Corasick, RE2 and the stdlib re
+alternation) must report exactly what the original per-term regex scan did.
+"""
+
+import json
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.core import translator as translator_module
+from src.core.translator import GLOSSARY_MATCH_FIELDS, Translator
+
+
+GLOSSARY = {
+    "cardiovascular": [
+        {"source": "hypertension", "target": "shinikizo la damu", "context": "medical/cardiology", "confidence": 1.0},
+        {"source": "blood pressure", "target": "shinikizo la damu", "context": "medical/cardiology", "confidence": 0.95},
+        {"source": "heart rate", "target": "mapigo ya moyo", "context": "medical/cardiology", "confidence": 0.9},
+        {"source": "heart", "target": "moyo", "context": "medical", "confidence": 0.85}
+    ],
+    "general": [
+        {"source": "patient", "target": "mgonjwa", "context": "medical", "confidence": 0.8},
+        {"source": "rate reading", "target": "usomaji wa kiwango", "confidence": 0.7},
+        {"source": "résumé", "target": "wasifu", "context": "general/hr", "confidence": 0.75},
+        {"source": "sum", "target": "jumla", "confidence": 0.6}
+    ]
+}
+
+TEXTS = [
+    # Nested and overlapping terms
+    "Heart rate reading: heart rate and blood pressure, HEART RATE.",
+    "heart rateñ heart-rate heart_rate heartrate",
+    # Case folding that changes length or goes beyond str.lower()
+    "İhypertension hypertension",
+    "The patient has hypertenſion.",
+    # Word boundaries next to non-ASCII letters
+    "ñhypertension 日本hypertension ÉHYPERTENSION hypertension.",
+    "RÉSUMÉ, résumé; summary sum résumés",
+    # Non-ASCII characters before the matches shift byte offsets
+    "é" * 5 + " blood pressure " * 3 + "日本 heart",
+    ""
+]
+
+DOMAINS = [None, "medical", "medical/cardiology", "general"]
+
+# backend: (matcher kind, module it needs, modules hidden to force it)
+BACKENDS = {
+    "hyperscan": ("hyperscan", "hyperscan", ()),
+    "automaton": ("automaton", "ahocorasick", ("hyperscan",)),
+    "re2": ("regex", "re2", ("hyperscan", "ahocorasick")),
+    "re": ("regex", None, ("hyperscan", "ahocorasick", "re2"))
+}
+
+
+def per_term_matches(text, domain=None):
+    """The original glossary scan: one \\b-anchored regex per term."""
+    glossary = {}
+    for terms in GLOSSARY.values():
+        for term in terms:
+            glossary[term["source"].lower()] = term
+
+    matches = []
+    for source_term, term_data in sorted(glossary.items(), key=lambda x: len(x[0]), reverse=True):
+        if domain and term_data.get("context"):
+            if not term_data["context"].startswith(domain):
+                continue
+
+        pattern = re.compile(r"\b" + re.escape(source_term) + r"\b", re.IGNORECASE)
+        for match in pattern.finditer(text):
+            matches.append((
+                match.group(),
+                term_data["target"],
+                match.start(),
+                term_data["confidence"],
+                term_data.get("context", "")
+            ))
+    return sorted(matches, key=lambda m: (m[2], m[0]))
+
+
+def match_rows(glossary_matches):
+    """Turn column-wise glossary matches into sorted row tuples."""
+    rows = zip(*(glossary_matches[field] for field in GLOSSARY_MATCH_FIELDS))
+    return sorted(rows, key=lambda m: (m[2], m[0]))
+
+
+@pytest.fixture(params=list(BACKENDS))
+def translator(request, tmp_path, monkeypatch):
+    """A Translator over GLOSSARY whose matchers use one given backend."""
+    kind, required, hidden = BACKENDS[request.param]
+    if required:
+        pytest.importorskip(required)
+    for module in hidden:
+        monkeypatch.setitem(sys.modules, module, None)
+    # Let the small fixture glossary reach Hyperscan
+    monkeypatch.setattr(translator_module, "HYPERSCAN_MIN_TERMS", 1)
+
+    glossary_path = tmp_path / "glossary.json"
+    glossary_path.write_text(json.dumps(GLOSSARY), encoding="utf-8")
+    translator = Translator(glossary_path=str(glossary_path))
+
+    assert translator._matcher[0] == kind
+    return translator
+
+
+@pytest.mark.parametrize("domain", DOMAINS)
+@pytest.mark.parametrize("text", TEXTS)
+def test_matches_agree_with_per_term_scan(translator, text, domain):
+    _, glossary_matches = translator._apply_glossary(text, domain)
+
+    assert match_rows(glossary_matches) == per_term_matches(text, domain)
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_positions_index_source_text(translator, text):
+    _, glossary_matches = translator._apply_glossary(text)
+
+    for source, position in zip(glossary_matches["source"], glossary_matches["position"]):
+        assert text[position:position + len(source)] == source
+
+
+def test_index_round_trips_term_records():
+    glossary_path = Path(__file__).parent.parent / "glossaries" / "medical_terms.json"
+    data = json.loads(glossary_path.read_text(encoding="utf-8"))
+    index = Translator()._build_glossary_index(data)
+
+    # Later entries override earlier ones with the same source
+    entries = {term["source"].lower(): term for terms in data.values() for term in terms}
+    for source, term in entries.items():
+        term_id = index.terms[source]
+        assert index.target(term_id) == term["target"]
+        assert index.context(term_id) == term.get("context", "")
+        assert index.confidence(term_id) == round(term.get("confidence", 1.0), 2)